@@ -1,24 +1,23 @@
 # app.py (FULL - replace your current app.py with this)
 import streamlit as st
 from pathlib import Path
-import json
 import time
-import matplotlib.pyplot as plt
-import numpy as np
 import re
 import html
+import io
+import hashlib
 
 # import skill utilities
 try:
     from skill_utils import (
         extract_text_from_pdf_bytes,
         extract_text_from_docx,
-        extract_skills_from_text,
+        extract_skills_cached,
         compare_user_with_role_skills,
         fetch_github_profile_readme,
         fetch_github_languages,
         fetch_linkedin_public_text,
-        load_canonical_skills_and_embeddings
+        load_roles
     )
 except Exception as e:
     st.error(
@@ -33,38 +32,58 @@ st.set_page_config(page_title="SkillSense AI", page_icon="🧠", layout="wide")
 # -------------------------
 # Utility: highlight function
 # -------------------------
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _highlight_pattern(skills: tuple):
+    # longest first so "machine learning" wins over "machine" at the same position
+    alternation = "|".join(re.escape(html.escape(sk)) for sk in sorted(skills, key=len, reverse=True))
+    return re.compile(r'(?i)\b(' + alternation + r')\b')
+
 def highlight_text(text: str, matched: list):
     """
     Return HTML-safe text with matched skill phrases highlighted.
-    - sorts matched by length desc to avoid partial overlapping replacements
-    - uses re.sub with (?i) for case-insensitive replacement
+    - all skills go into one case-insensitive alternation, compiled once per skill set
+    - longest skills first to avoid partial overlapping replacements
     - escapes original text first to avoid breaking HTML
     """
     if not text:
         return ""
     safe = html.escape(text)
-    matched_sorted = sorted([m for m in (matched or []) if m], key=lambda s: -len(s))
-    highlighted = safe
-    for sk in matched_sorted:
-        try:
-            # whole-word-ish, case-insensitive
-            pattern = r'(?i)\b' + re.escape(sk) + r'\b'
-            highlighted = re.sub(pattern, f"<mark style='background:#a7f3d0'>{sk}</mark>", highlighted)
-        except re.error:
-            try:
-                highlighted = re.sub(re.escape(sk), f"<mark style='background:#a7f3d0'>{sk}</mark>", highlighted, flags=re.IGNORECASE)
-            except Exception:
-                pass
-    return highlighted
+    skills = tuple(sorted({m for m in (matched or []) if m}))
+    if not skills:
+        return safe
+    pattern = _highlight_pattern(skills)
+    return pattern.sub(lambda m: f"<mark style='background:#a7f3d0'>{m.group(0)}</mark>", safe)
+
+# -------------------------
+# Skill coverage categories
+# -------------------------
+CAT_KEYWORDS = {
+    "Programming": ["python","java","javascript","react","kotlin","swift","solidity"],
+    "Data/ML": ["machine","ml","data","pandas","numpy","tableau","power bi","spark"],
+    "Cloud/Infra": ["aws","docker","kubernetes","terraform","ci/cd","linux","gcp","azure","jenkins"],
+    "Design/PM": ["product","pm","ux","ui","figma","design","a/b","growth"],
+}
+DEFAULT_CATEGORY = "Soft Skills"
+# one alternation per category, checked in order (first match wins)
+CAT_PATTERNS = {cat: re.compile("|".join(map(re.escape, kws))) for cat, kws in CAT_KEYWORDS.items()}
+
+@st.cache_data(show_spinner=False)
+def _role_skill_categories(role_skills: tuple):
+    # skill -> coverage category, computed once per role
+    return {
+        s: next((cat for cat, pat in CAT_PATTERNS.items() if pat.search(s.strip().lower())), DEFAULT_CATEGORY)
+        for s in role_skills
+    }
 
 # ---- Sidebar: settings, sample inputs, mode ----
 st.sidebar.title("SkillSense Controls")
 st.sidebar.markdown("**Demo helpers**")
 st.sidebar.markdown("- Choose `Fast mode` for instant keyword-only matching.")
-st.sidebar.markdown("- Use `Precomputed embeddings` if you ran precompute script.")
+st.sidebar.markdown("- Use `Save and reuse skill embeddings` to keep them on disk between runs.")
 
 fast_mode = st.sidebar.checkbox("Fast Mode (keyword only, fastest)", value=False)
-use_precomputed = st.sidebar.checkbox("Use precomputed canonical_embs.npy (if available)", value=False)
+model_name = "all-MiniLM-L6-v2"
+use_precomputed = st.sidebar.checkbox("Save and reuse skill embeddings (canonical_embs.*.npy)", value=False)
 precomputed_path = "canonical_embs.npy" if use_precomputed else None
 
 st.sidebar.divider()
@@ -96,7 +115,7 @@ roles_path = BASE / "roles.json"
 if not roles_path.exists():
     st.error("roles.json missing. Add roles.json (grouped roles) to project root.")
     st.stop()
-grouped_roles = json.load(open(roles_path, "r", encoding="utf8"))
+grouped_roles = load_roles()
 
 # ---- App header / hero ----
 st.title("🧠 SkillSense AI — Identify skills, close gaps")
@@ -121,21 +140,31 @@ selected_role = st.selectbox("Select Role:", roles_in_profile)
 role_skill_list = grouped_roles[selected_profile][selected_role]
 
 # ---- Helper: gather text from uploads / GH / LinkedIn ----
+@st.cache_data(show_spinner=False, max_entries=16)
+def _extract_upload_text(kind: str, name: str, size: int, digest: str, _data: bytes):
+    # keyed on (name, size, md5) so an uploaded file is parsed once, not on every rerun
+    if kind == "pdf":
+        return extract_text_from_pdf_bytes(io.BytesIO(_data))
+    return extract_text_from_docx(io.BytesIO(_data))
+
 raw_text = ""
 if uploaded:
+    # read the upload once; every parser below works on this buffer
+    data = uploaded.getvalue()
+    digest = hashlib.md5(data).hexdigest()
     if uploaded.type == "application/pdf" or str(uploaded.name).lower().endswith(".pdf"):
         try:
-            raw_text = extract_text_from_pdf_bytes(uploaded)
+            raw_text = _extract_upload_text("pdf", uploaded.name, len(data), digest, data)
         except Exception as e:
             st.warning("PDF extraction issue, try pasting text. " + str(e))
     elif uploaded.type in ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",) or str(uploaded.name).lower().endswith(".docx"):
         try:
-            raw_text = extract_text_from_docx(uploaded)
+            raw_text = _extract_upload_text("docx", uploaded.name, len(data), digest, data)
         except Exception as e:
             st.warning("DOCX extraction issue, try pasting text. " + str(e))
     else:
         try:
-            raw_text = uploaded.getvalue().decode("utf-8", errors="ignore")
+            raw_text = data.decode("utf-8", errors="ignore")
         except Exception:
             raw_text = ""
 # If GitHub username provided, append GH readme/desc
@@ -167,12 +196,12 @@ if analyze:
             # choose use_embeddings boolean
             use_embeddings = not fast_mode
             # pass precomputed_path if available
-            skills = extract_skills_from_text(
+            skills = extract_skills_cached(
                 raw_text,
                 use_embeddings=use_embeddings,
-                threshold=0.56,
                 max_sentences=40,
-                precomputed_emb_path=precomputed_path
+                precomputed_emb_path=precomputed_path,
+                model_name=model_name
             )
             t1 = time.time()
             elapsed = t1 - t0
@@ -184,11 +213,10 @@ if analyze:
         st.success("Analysis complete ✅")
 
         # compute matching and a simple match score
-        matching_count = len(comp.get("have", []))
+        matching_count = len(comp.get("matching", []))
         missing_count = len(comp.get("missing", []))
         extra_count = len(comp.get("extra", []))
-        total_required = max(1, len(role_skill_list))
-        match_score = matching_count / total_required
+        match_score = comp.get("score", 0)
 
         # top metrics: role, counts, elapsed
         top_col, m1, m2, time_col = st.columns([2,1,1,1])
@@ -265,7 +293,7 @@ if analyze:
         # Highlight parsed resume (safe)
         st.subheader("Parsed Resume (highlights)")
         try:
-            highlighted_html = highlight_text(raw_text[:8000], comp.get("have", []) + comp.get("missing", []))
+            highlighted_html = highlight_text(raw_text[:8000], comp.get("matching", []) + comp.get("missing", []))
             st.markdown(highlighted_html, unsafe_allow_html=True)
         except Exception:
             st.text_area("Parsed text", raw_text[:8000], height=200)
@@ -285,32 +313,30 @@ if analyze:
 
         # Skill coverage bar chart (by simple categories)
         st.subheader("Skill coverage (by simple categories)")
-        cats = {"Programming":0, "Data/ML":0, "Cloud/Infra":0, "Design/PM":0, "Soft Skills":0}
+        cats = {k:0 for k in CAT_PATTERNS}
+        cats[DEFAULT_CATEGORY] = 0
         cat_total = {k:0 for k in cats}
+        matching_set = set(comp.get("matching", []))
+        skill_categories = _role_skill_categories(tuple(role_skill_list))
         for s in role_skill_list:
-            sl = s.lower()
-            if any(k in sl for k in ["python","java","javascript","react","kotlin","swift","solidity"]):
-                cat = "Programming"
-            elif any(k in sl for k in ["machine","ml","data","pandas","numpy","tableau","power bi","spark"]):
-                cat = "Data/ML"
-            elif any(k in sl for k in ["aws","docker","kubernetes","terraform","ci/cd","linux","gcp","azure","jenkins"]):
-                cat = "Cloud/Infra"
-            elif any(k in sl for k in ["product","pm","ux","ui","figma","design","a/b","growth"]):
-                cat = "Design/PM"
-            else:
-                cat = "Soft Skills"
+            cat = skill_categories[s]
             cat_total[cat] += 1
-            if s in skills:
+            if s.strip().lower() in matching_set:
                 cats[cat] += 1
 
         categories = list(cats.keys())
         values = [cats[c]/max(1, cat_total[c]) for c in categories]
 
+        # matplotlib is only imported once a chart is actually drawn (keeps reruns cheap)
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(6,3))
         ax.bar(categories, values)
         ax.set_ylim(0,1)
         ax.set_ylabel("Coverage (0-1)")
         st.pyplot(fig)
+        plt.close(fig)
 
         st.divider()
 
@@ -10,44 +10,308 @@ Skill utilities for SkillSense:
 """
 
 from pathlib import Path
+import contextlib
+import os
 import json
+import hashlib
+import importlib.util
+import heapq
 import re
 import numpy as np
-import time
 import streamlit as st
 
 BASE_DIR = Path(__file__).parent
+ENCODE_BATCH_SIZE = 32
+# word-count bucket bounds: each bucket is encoded separately so no batch pads short lines to a long one
+LENGTH_BUCKETS = (16, 32, 64)
+EMB_CACHE_DIR = BASE_DIR / ".emb_cache"
+ONNX_EXPORT_DIR = BASE_DIR / "onnx-minilm"
+ONNX_MODEL_DIR = BASE_DIR / "onnx-minilm-int8"
+ONNX_HUB_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# static embedding model: token-embedding lookup + mean pool, no transformer forward pass
+STATIC_MODEL_NAME = "sentence-transformers/static-retrieval-mrl-en-v1"
+# embedding_match threshold per model, calibrated on sample_resumes/; models without an entry
+# (STATIC_MODEL_NAME has not been calibrated yet) need an explicit threshold
+MODEL_THRESHOLDS = {"all-MiniLM-L6-v2": 0.56}
 
 # -------------------------
 # Cached model + canonical
 # -------------------------
+@st.cache_resource(show_spinner=False)
+def _export_onnx_int8(model_dir: str):
+    """
+    One-off export of all-MiniLM-L6-v2 to ONNX (kept in ONNX_EXPORT_DIR) followed by dynamic
+    int8 quantization (AVX512-VNNI config) into model_dir. Returns True on success.
+    """
+    import shutil
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(ONNX_HUB_MODEL)
+        model = ORTModelForFeatureExtraction.from_pretrained(ONNX_HUB_MODEL, export=True)
+        model.save_pretrained(str(ONNX_EXPORT_DIR))
+        tokenizer.save_pretrained(str(ONNX_EXPORT_DIR))
+        # quantize into a temp dir and rename, so a failed run never leaves a half-written model_dir
+        tmp_dir = Path(model_dir).with_name(Path(model_dir).name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        ORTQuantizer.from_pretrained(model).quantize(save_dir=str(tmp_dir), quantization_config=qconfig)
+        tokenizer.save_pretrained(str(tmp_dir))
+        os.replace(tmp_dir, model_dir)
+        return True
+    except Exception:
+        return False
+
+def _onnx_model_dir(model_name: str):
+    # ONNX int8 MiniLM, used whenever optimum is installed (exported on first use, see README)
+    if model_name != "all-MiniLM-L6-v2" or importlib.util.find_spec("optimum") is None:
+        return None
+    if not ONNX_MODEL_DIR.exists() and not _export_onnx_int8(str(ONNX_MODEL_DIR)):
+        return None
+    # a directory without a model file (e.g. an interrupted manual quantize) is not usable
+    if not any((ONNX_MODEL_DIR / name).exists() for name in ("model_quantized.onnx", "model.onnx")):
+        return None
+    return ONNX_MODEL_DIR
+
+def _onnx_tokenizer_source(model_dir: Path):
+    # `optimum-cli onnxruntime quantize` writes no tokenizer files: fall back to the exported
+    # model's directory, then to the hub model
+    for d in (model_dir, ONNX_EXPORT_DIR):
+        if (d / "tokenizer_config.json").exists():
+            return str(d)
+    return ONNX_HUB_MODEL
+
+def _encoder_id(model_name: str):
+    # ONNX int8 vectors differ slightly from the PyTorch ones, so cached embeddings are kept apart
+    return model_name + "-onnx-int8" if _onnx_model_dir(model_name) else model_name
+
+class _OnnxSentenceEncoder:
+    """
+    SentenceTransformer.encode stand-in that runs an exported (int8-quantized) MiniLM
+    through ONNX Runtime: tokenize -> ORT forward -> attention-masked mean pooling.
+    """
+
+    def __init__(self, model_dir: Path, max_seq_length: int = 256):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        quantized = model_dir / "model_quantized.onnx"
+        file_name = quantized.name if quantized.exists() else "model.onnx"
+        self.tokenizer = AutoTokenizer.from_pretrained(_onnx_tokenizer_source(model_dir))
+        self.model = ORTModelForFeatureExtraction.from_pretrained(str(model_dir), file_name=file_name)
+        self.max_seq_length = max_seq_length
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True, normalize_embeddings: bool = False, show_progress_bar: bool = False):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        # encode in length order so each batch pads to similar lengths, then restore input order
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        out = []
+        for start in range(0, len(order), batch_size):
+            batch = [sentences[i] for i in order[start:start + batch_size]]
+            tokens = self.tokenizer(batch, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np")
+            hidden = np.asarray(self.model(**tokens).last_hidden_state, dtype=np.float32)
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            embs = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                embs = _l2_normalize(embs)
+            out.append(embs)
+        if not out:
+            return np.zeros((0, 0), dtype=np.float32)
+        sorted_embs = np.vstack(out)
+        embs = np.empty_like(sorted_embs)
+        embs[order] = sorted_embs
+        return embs[0] if single else embs
+
 @st.cache_resource(show_spinner=False)
 def get_sentence_transformer(model_name: str = "all-MiniLM-L6-v2"):
+    """
+    Returns an object with SentenceTransformer's encode() API: the ONNX Runtime int8
+    encoder when optimum is installed (see _onnx_model_dir), else the PyTorch model.
+    """
+    onnx_dir = _onnx_model_dir(model_name)
+    if onnx_dir is not None:
+        return _OnnxSentenceEncoder(onnx_dir)
     # lazy import to avoid heavy startup until Streamlit session uses it
+    import torch
     from sentence_transformers import SentenceTransformer
+    torch.set_num_threads(os.cpu_count() or 1)
+    try:
+        # a single encode call at a time: inter-op parallelism only adds scheduling overhead
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # can only be set once per process, before any inter-op work
+        pass
     model = SentenceTransformer(model_name)
+    model.eval()
     return model
 
+def _length_buckets(sentences):
+    # input positions grouped by word-count bucket (LENGTH_BUCKETS bounds, plus one open-ended bucket)
+    buckets = {}
+    for i, sent in enumerate(sentences):
+        buckets.setdefault(int(np.searchsorted(LENGTH_BUCKETS, len(sent.split()))), []).append(i)
+    return [buckets[b] for b in sorted(buckets)]
+
+def _encode(model, sentences):
+    """
+    model.encode with the shared batch settings, returning unit-norm C-contiguous float32
+    rows in input order. Sentences are encoded per length bucket (see LENGTH_BUCKETS).
+    PyTorch models run under torch.inference_mode (no autograd bookkeeping).
+    """
+    ctx = contextlib.nullcontext()
+    if not isinstance(model, _OnnxSentenceEncoder):
+        import torch
+        ctx = torch.inference_mode()
+    buckets = _length_buckets(sentences)
+    with ctx:
+        parts = [model.encode([sentences[i] for i in idx], batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False) for idx in buckets]
+    if len(parts) <= 1:
+        embs = parts[0] if parts else np.zeros((0, 0), dtype=np.float32)
+        return np.ascontiguousarray(embs, dtype=np.float32)
+    embs = np.empty((len(sentences), parts[0].shape[1]), dtype=np.float32)
+    for idx, part in zip(buckets, parts):
+        embs[idx] = part
+    return embs
+
+def _l2_normalize(x: np.ndarray):
+    x = np.asarray(x, dtype=np.float32)
+    return x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-12)
+
+def ontology_fingerprint():
+    """
+    Content hash of skills_ontology.json. Passed to the cached loaders below so that
+    editing the ontology changes their cache key instead of serving stale results.
+    """
+    skills_path = BASE_DIR / "skills_ontology.json"
+    if not skills_path.exists():
+        return ""
+    return hashlib.blake2b(skills_path.read_bytes(), digest_size=16).hexdigest()
+
 @st.cache_data(show_spinner=False)
-def load_canonical_skills_and_embeddings(precomputed_emb_path: str = None, model_name: str = "all-MiniLM-L6-v2"):
+def load_skills_ontology(fingerprint: str = None):
     """
-    Returns (skills_list, embeddings_numpy).
-    If precomputed_emb_path provided and exists, loads .npy and skills_list.json.
-    Otherwise computes embeddings with sentence-transformers and caches result.
+    Returns the canonical skills list from skills_ontology.json (parsed once per fingerprint).
     """
     skills_path = BASE_DIR / "skills_ontology.json"
     if not skills_path.exists():
         raise FileNotFoundError("skills_ontology.json not found in project root.")
     with open(skills_path, "r", encoding="utf8") as f:
-        skills = json.load(f)
+        return json.load(f)
+
+def _meta_path(path: Path):
+    # canonical_embs.npy -> canonical_embs.meta.json
+    return path.with_suffix(".meta.json")
+
+def _encoder_path(path: Path, model_name: str):
+    # canonical_embs.npy -> canonical_embs.<encoder id>.npy: one set of precomputed artifacts per
+    # encoder, so switching models never replaces files another session still has loaded
+    encoder = re.sub(r'[^A-Za-z0-9_-]', '_', _encoder_id(model_name))
+    return path.with_name(f"{path.stem}.{encoder}{path.suffix}")
+
+def _replace_file(path: Path, write):
+    # write(tmp_path) into a uniquely named sibling temp file, then swap it in: readers never see a
+    # half-written file, live memory maps of the old one keep their own (unchanged) pages, and
+    # workers rebuilding at the same time never write into each other's temp file
+    import tempfile
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.stem + ".", suffix=".tmp" + path.suffix)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def _write_json(path: Path, obj):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf8") as f:
+            json.dump(obj, f)
+    _replace_file(path, write)
+
+def _write_meta(path: Path, fingerprint: str, model_name: str, embs: np.ndarray):
+    # every persisted matrix comes out of encode_skills_cached, i.e. already unit-norm float32
+    meta = {"hash": fingerprint, "model_name": _encoder_id(model_name), "dim": int(embs.shape[1]), "count": int(embs.shape[0]), "normalized": True}
+    _write_json(_meta_path(path), meta)
+
+def _read_meta(path: Path):
+    try:
+        return json.load(open(_meta_path(path), "r", encoding="utf8"))
+    except Exception:
+        return {}
+
+def _meta_matches(path: Path, fingerprint: str, model_name: str, count: int, dim: int = None):
+    # a persisted artifact is only reused if it was built from this ontology with this model
+    # (and stored unit-norm, so it is used as loaded)
+    meta = _read_meta(path)
+    return (
+        meta.get("normalized") is True
+        and meta.get("hash") == fingerprint
+        and meta.get("model_name") == _encoder_id(model_name)
+        and meta.get("count") == count
+        and (dim is None or meta.get("dim") == dim)
+    )
+
+def _skill_key(skill: str):
+    return hashlib.blake2b(skill.encode("utf8"), digest_size=16).hexdigest()
+
+def encode_skills_cached(skills, model_name: str = "all-MiniLM-L6-v2"):
+    """
+    Returns unit-norm float32 embeddings for skills (in order) through a content-addressed
+    cache: .emb_cache/<encoder id>.npz maps blake2b(skill) -> float16 vector, so only skills not
+    seen before with this model are encoded (an ontology edit re-embeds just the delta).
+    """
+    cache_path = EMB_CACHE_DIR / (re.sub(r'[^A-Za-z0-9_.-]', '_', _encoder_id(model_name)) + ".npz")
+    cached = {}
+    if cache_path.exists():
+        try:
+            with np.load(str(cache_path)) as data:
+                cached = {k: data[k] for k in data.files}
+        except Exception:
+            cached = {}
+    keys = [_skill_key(s) for s in skills]
+    to_encode = list(dict.fromkeys(s for s, k in zip(skills, keys) if k not in cached))
+    if to_encode:
+        model = get_sentence_transformer(model_name)
+        new_embs = _encode(model, to_encode)
+        for skill, emb in zip(to_encode, new_embs):
+            # stored as float16: half the file size, well below the threshold's resolution
+            cached[_skill_key(skill)] = np.asarray(emb, dtype=np.float16)
+        try:
+            EMB_CACHE_DIR.mkdir(exist_ok=True)
+            _replace_file(cache_path, lambda tmp_path: np.savez(str(tmp_path), **cached))
+        except Exception:
+            pass
+    # upcast to float32 (numpy has no fast fp16 matmul) and re-normalize after the rounding
+    return _l2_normalize(np.stack([cached[k] for k in keys]))
+
+@st.cache_resource(show_spinner=False)
+def load_canonical_skills_and_embeddings(precomputed_emb_path: str = None, model_name: str = "all-MiniLM-L6-v2", fingerprint: str = None):
+    """
+    Returns (skills_list, embeddings_numpy) with embeddings as L2-normalized float32 rows,
+    so similarity against them is a plain dot product.
+    Cached as a shared resource: the embeddings are a read-only array (memory-mapped when
+    loaded from precomputed_emb_path, so processes share the page cache) that callers must not modify.
+    fingerprint: ontology_fingerprint(), part of the cache key (computed here if None).
+    If precomputed_emb_path provided (e.g. canonical_embs.npy), loads the encoder's
+    canonical_embs.<encoder id>.npy and skills_list.<encoder id>.json beside it, provided
+    their .meta.json records the same ontology hash, model and shape.
+    Otherwise embeds the skills through encode_skills_cached and caches result
+    (also writing them and their meta to precomputed_emb_path when given).
+    """
+    if fingerprint is None:
+        fingerprint = ontology_fingerprint()
+    skills = load_skills_ontology(fingerprint)
 
     # try loading precomputed files if provided
     if precomputed_emb_path:
-        emb_path = Path(precomputed_emb_path)
-        skills_list_path = emb_path.with_name("skills_list.json")
-        if emb_path.exists() and skills_list_path.exists():
+        emb_path = _encoder_path(Path(precomputed_emb_path), model_name)
+        skills_list_path = _encoder_path(emb_path.with_name("skills_list.json"), model_name)
+        if emb_path.exists() and skills_list_path.exists() and _meta_matches(emb_path, fingerprint, model_name, len(skills)):
             try:
-                embs = np.load(str(emb_path))
+                embs = np.load(str(emb_path), mmap_mode="r")
                 # load skills list if present
                 try:
                     skills_loaded = json.load(open(skills_list_path, "r", encoding="utf8"))
@@ -57,23 +321,155 @@ def load_canonical_skills_and_embeddings(precomputed_emb_path: str = None, model
             except Exception:
                 pass
 
-    # compute embeddings (slow first-time)
-    model = get_sentence_transformer(model_name)
-    embs = model.encode(skills, convert_to_numpy=True, show_progress_bar=False)
+    # embed (slow first-time; later only skills missing from the per-skill cache)
+    embs = encode_skills_cached(skills, model_name)
+    if precomputed_emb_path:
+        # persist unit-norm float32 so later runs can take the precomputed branch; never rewritten
+        # in place, since a previously loaded (memory-mapped) copy may still be in use
+        emb_path = _encoder_path(Path(precomputed_emb_path), model_name)
+        try:
+            _replace_file(emb_path, lambda tmp_path: np.save(str(tmp_path), embs))
+            _write_json(_encoder_path(emb_path.with_name("skills_list.json"), model_name), skills)
+            _write_meta(emb_path, fingerprint, model_name, embs)
+        except Exception:
+            pass
+    embs.setflags(write=False)
     return skills, embs
 
+# HNSW search breadth; range searches stop early when it is small, dropping hits above threshold
+HNSW_EF_SEARCH = 64
+# upper bound on the 8-bit scalar quantizer's score error for unit-norm vectors (observed ~4e-4)
+SQ_SCORE_MARGIN = 2e-3
+
+@st.cache_resource(show_spinner=False)
+def get_canonical_index(precomputed_emb_path: str = None, model_name: str = "all-MiniLM-L6-v2", fingerprint: str = None):
+    """
+    Returns a FAISS inner-product HNSW index over the L2-normalized canonical embeddings
+    (stored as int8 codes), or None when faiss is not installed (embedding_match then falls back to numpy).
+    If precomputed_emb_path is provided, the index is persisted as canonical.<encoder id>.faiss
+    beside it (with its .meta.json, checked like the embeddings' meta).
+    """
+    try:
+        import faiss
+    except ImportError:
+        return None
+    if fingerprint is None:
+        fingerprint = ontology_fingerprint()
+    _, embs = load_canonical_skills_and_embeddings(precomputed_emb_path, model_name, fingerprint)
+    embs = np.ascontiguousarray(embs, dtype=np.float32)  # already unit-norm
+
+    index_path = _encoder_path(Path(precomputed_emb_path).with_name("canonical.faiss"), model_name) if precomputed_emb_path else None
+    if index_path is not None and index_path.exists() and _meta_matches(index_path, fingerprint, model_name, embs.shape[0], embs.shape[1]):
+        try:
+            index = faiss.read_index(str(index_path))
+            if index.ntotal == embs.shape[0] and index.d == embs.shape[1]:
+                index.hnsw.efSearch = HNSW_EF_SEARCH
+                return index
+        except Exception:
+            pass
+
+    # 8-bit scalar-quantized storage: a quarter of the float32 bytes read per distance
+    index = faiss.IndexHNSWSQ(embs.shape[1], faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = 80
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    index.train(embs)
+    index.add(embs)
+    if index_path is not None:
+        try:
+            _replace_file(index_path, lambda tmp_path: faiss.write_index(index, str(tmp_path)))
+            _write_meta(index_path, fingerprint, model_name, embs)
+        except Exception:
+            pass
+    return index
+
+@st.cache_resource(show_spinner=False)
+def get_canonical_matrix_t(precomputed_emb_path: str = None, model_name: str = "all-MiniLM-L6-v2", fingerprint: str = None):
+    """
+    Canonical embeddings as a float32 (dim, n_skills) transposed view, without copying
+    (memory-mapped) rows: numpy hands it to sgemm as a transposed operand, so the numpy
+    fallback in embedding_match is still a straight sgemm (cand_embs @ matrix).
+    """
+    _, embs = load_canonical_skills_and_embeddings(precomputed_emb_path, model_name, fingerprint)
+    return np.asarray(embs, dtype=np.float32).T
+
 # -------------------------
 # Text extraction helpers
 # -------------------------
+MAX_PAGES = 10
+SCANNED_CHECK_PAGES = 3
+SCANNED_MIN_CHARS = 200
+
+def _pdfium_text(bytes_io):
+    # PDFium (C++) text extraction; None when pypdfium2 is missing or the file can't be parsed
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        return None
+    try:
+        pdf = pdfium.PdfDocument(bytes_io)
+        try:
+            text_pages = []
+            for i in range(min(len(pdf), MAX_PAGES)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text_pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+            return "\n".join(text_pages)
+        finally:
+            pdf.close()
+    except Exception:
+        return None
+
+def _pypdf_text(bytes_io):
+    # pypdf text extraction; None when pypdf is missing or the file can't be parsed
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    try:
+        reader = PdfReader(bytes_io)
+        return "\n".join(page.extract_text() or "" for page in reader.pages[:MAX_PAGES])
+    except Exception:
+        return None
+
+def _extract_pdf_text_fast(bytes_io):
+    """
+    Text-only extraction without pdfplumber's layout model: pypdfium2 (PDFium) when
+    installed, else pypdf. Returns None when neither is available or can parse the file.
+    """
+    text = _pdfium_text(bytes_io)
+    if text is None:
+        bytes_io.seek(0)
+        text = _pypdf_text(bytes_io)
+    return text
+
 def extract_text_from_pdf_bytes(bytes_io):
     """
     bytes_io: an uploaded file-like object from Streamlit
-    Returns string
+    Returns string (at most MAX_PAGES pages; resumes are shorter than that)
+    Tries the pypdfium2 / pypdf fast path first and only runs pdfplumber when it yields too little text.
     """
+    text = _extract_pdf_text_fast(bytes_io)
+    if text and len(text.strip()) >= SCANNED_MIN_CHARS:
+        return text
+    bytes_io.seek(0)
     import pdfplumber
     try:
+        text_pages = []
+        n_chars = 0
         with pdfplumber.open(bytes_io) as pdf:
-            text_pages = [page.extract_text() or "" for page in pdf.pages]
+            for i, page in enumerate(pdf.pages):
+                if i >= MAX_PAGES:
+                    break
+                page_text = page.extract_text() or ""
+                text_pages.append(page_text)
+                n_chars += len(page_text.strip())
+                # drop the parsed chars/objects before moving to the next page
+                page.flush_cache()
+                # almost no text layer after the first pages: scanned PDF, nothing more to get without OCR
+                if i + 1 == SCANNED_CHECK_PAGES and n_chars < SCANNED_MIN_CHARS:
+                    break
         return "\n".join(text_pages)
     except Exception as e:
         # fallback: try reading .read()
@@ -103,107 +499,340 @@ def extract_text_from_docx(file_obj):
             document = Document(tmp.name)
             return "\n".join([p.text for p in document.paragraphs])
 
+_CLEAN_RE = re.compile(r'[^a-z0-9\.\,\-\n &]')
+_WS_RE = re.compile(r'\s+')
+_HWS_RE = re.compile(r'[^\S\n]+')
+
 def simple_text_cleanup(text: str):
     if not text:
         return ""
-    text = text.lower()
-    # keep typical punctuation for sentence split, remove odd chars
-    text = re.sub(r'[^a-z0-9\.\,\-\n &]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # keep typical punctuation for sentence split, remove odd chars, collapse whitespace
+    return _WS_RE.sub(' ', _CLEAN_RE.sub(' ', text.lower())).strip()
+
+def _cleanup_lines(text: str):
+    # simple_text_cleanup, but keeping one (non-empty) line per input line for embedding_match's
+    # candidate lines; replacing its newlines with spaces gives exactly simple_text_cleanup(text)
+    if not text:
+        return ""
+    cleaned = _HWS_RE.sub(' ', _CLEAN_RE.sub(' ', text.lower()))
+    return "\n".join(ln.strip() for ln in cleaned.split("\n") if ln.strip())
 
 # -------------------------
 # Keyword & embedding match
 # -------------------------
-def keyword_match(text: str, canonical_skills=None):
-    text_l = text.lower()
+@st.cache_resource(show_spinner=False)
+def get_skill_keys(skills_key: int, _skills):
+    """
+    (lowercased skill, skill) pairs for the non-empty canonical skills, lowercased once per
+    skills list instead of on every keyword_match call (keyed like get_skill_automaton).
+    """
+    return tuple((skill.lower(), skill) for skill in _skills if skill)
+
+@st.cache_resource(show_spinner=False)
+def get_skill_automaton(skills_key: int, _skills):
+    """
+    Aho-Corasick automaton over the lowercased canonical skills, so keyword_match
+    scans the text once instead of once per skill.
+    skills_key: hash(tuple(skills)); Streamlit keys the cache on it instead of
+    re-hashing every skill string on each call (_skills is left out of the key).
+    Returns None when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for key, skill in get_skill_keys(skills_key, _skills):
+        automaton.add_word(key, (len(key), skill))
+    automaton.make_automaton()
+    return automaton
+
+def _scan_skills_kernel(text, needles, offsets, word_chars):
+    # compiled by _numba_skill_scanner: text and needles are code points (UTF-32), needle j is
+    # needles[offsets[j]:offsets[j + 1]]; same left-edge rule as _starts_word, with the non-ASCII
+    # code points of the text that are str.isalnum() passed in sorted as word_chars
+    n = len(offsets) - 1
+    found = np.zeros(n, dtype=np.bool_)
+    text_len = len(text)
+    for j in range(n):
+        start = offsets[j]
+        size = offsets[j + 1] - start
+        for i in range(text_len - size + 1):
+            if text[i] != needles[start]:
+                continue
+            if i > 0:
+                c = text[i - 1]
+                if (48 <= c <= 57) or (97 <= c <= 122) or (65 <= c <= 90):
+                    continue
+                if c >= 128:
+                    pos = np.searchsorted(word_chars, c)
+                    if pos < len(word_chars) and word_chars[pos] == c:
+                        continue
+            k = 1
+            while k < size and text[i + k] == needles[start + k]:
+                k += 1
+            if k == size:
+                found[j] = True
+                break
+    return found
+
+@st.cache_resource(show_spinner=False)
+def _numba_skill_scanner():
+    """
+    _scan_skills_kernel compiled with Numba (on-disk cached), used by keyword_match when
+    pyahocorasick is missing. Returns None when numba is not installed.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True, nogil=True)(_scan_skills_kernel)
+
+@st.cache_resource(show_spinner=False)
+def get_skill_needles(skills_key: int, _skills):
+    # lowercased skills as one concatenated code point (uint32) buffer plus offsets, for _scan_skills_kernel
+    keys = [key for key, _ in get_skill_keys(skills_key, _skills)]
+    needles = np.frombuffer("".join(keys).encode("utf-32-le"), dtype=np.uint32)
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum([len(k) for k in keys], out=offsets[1:])
+    return needles, offsets
+
+def _starts_word(text_l: str, start: int):
+    # only the left edge is checked so suffixed forms ("dockerized") still count,
+    # while mid-word hits ("git" in "digital", "ios" in "scenarios") are dropped
+    return start == 0 or not text_l[start - 1].isalnum()
+
+def keyword_match(text: str, canonical_skills=None, already_lower: bool = False):
+    """
+    Canonical skills occurring in text (case-insensitive, left word boundary), sorted.
+    already_lower: text is lowercase already (e.g. simple_text_cleanup output), skip lowering it again.
+    """
+    text_l = text if already_lower else text.lower()
     found = set()
     if canonical_skills is None:
-        canonical_skills, _ = load_canonical_skills_and_embeddings()
-    for skill in canonical_skills:
-        if skill and skill.lower() in text_l:
-            found.add(skill)
+        # the ontology alone; exact matching needs neither the model nor the embeddings
+        canonical_skills = load_skills_ontology(ontology_fingerprint())
+    skills = tuple(canonical_skills)
+    skills_key = hash(skills)
+    automaton = get_skill_automaton(skills_key, skills)
+    if automaton is not None:
+        for end, (key_len, skill) in automaton.iter(text_l):
+            if _starts_word(text_l, end - key_len + 1):
+                found.add(skill)
+        return sorted(found)
+    skill_keys = get_skill_keys(skills_key, skills)
+    scanner = _numba_skill_scanner()
+    if scanner is not None:
+        needles, offsets = get_skill_needles(skills_key, skills)
+        # non-ASCII alphanumerics, from the (small) set of distinct characters in the text
+        word_chars = np.array(sorted(ord(c) for c in set(text_l) if c >= "\x80" and c.isalnum()), dtype=np.uint32)
+        mask = scanner(np.frombuffer(text_l.encode("utf-32-le"), dtype=np.uint32), needles, offsets, word_chars)
+        return sorted({skill for (_, skill), hit in zip(skill_keys, mask) if hit})
+    # last resort: one substring scan per skill
+    for key, skill in skill_keys:
+        start = text_l.find(key)
+        while start != -1:
+            if _starts_word(text_l, start):
+                found.add(skill)
+                break
+            start = text_l.find(key, start + 1)
     return sorted(found)
 
-def cosine_sim_numpy(a: np.ndarray, b: np.ndarray):
-    # a: (m, d), b: (n, d) -> (m, n)
-    # normalize
-    an = a / np.linalg.norm(a, axis=1, keepdims=True)
-    bn = b / np.linalg.norm(b, axis=1, keepdims=True)
-    return np.dot(an, bn.T)
+SEP_RE = re.compile(r'[-••–—:;]')
+YEAR_RE = re.compile(r'\d{4}')
+ACTION_RE = re.compile(r'experience|developed|built|worked|managed|implemented|designed|deployed|using|utiliz', re.IGNORECASE)
 
-def embedding_match(text: str, top_k: int = 6, threshold: float = 0.56, max_sentences: int = 40, model_name: str = "all-MiniLM-L6-v2", precomputed_emb_path: str = None):
+def _line_score(ln: str):
+    # heuristics: give priority to lines with dashes, bullets, colons, years, short phrases or action verbs
+    score = 0
+    if SEP_RE.search(ln):
+        score += 1
+    if YEAR_RE.search(ln):  # contains a year
+        score += 1
+    if len(ln.split()) <= 5:
+        score += 1
+    if ACTION_RE.search(ln):
+        score += 2
+    return score
+
+def _candidate_lines(text: str, max_sentences: int, skip=frozenset()):
+    # split into candidate sentences/lines; repeated lines (headers, bullets) are encoded once,
+    # duplicates add nothing to a max-per-skill score; lines in skip (lowercased) are dropped
+    lines = list(dict.fromkeys(l.strip() for l in text.splitlines() if l.strip() and l.strip().lower() not in skip))
+    # keep the max_sentences best-scoring lines (stable: ties keep document order)
+    candidates = heapq.nlargest(max_sentences, lines, key=_line_score)
+    if not candidates:
+        # fallback: split full text into sentences
+        candidates = list(dict.fromkeys(s.strip() for s in re.split(r'[.\n]', text) if s.strip() and s.strip().lower() not in skip))[:max_sentences]
+    return candidates
+
+def embedding_match_many(texts, top_k: int = 6, threshold: float = 0.56, max_sentences: int = 40, model_name: str = "all-MiniLM-L6-v2", precomputed_emb_path: str = None, model=None, fingerprint: str = None, exclude_skills=None):
     """
-    Semantic fuzzy match using sentence-transformers embeddings and numpy cosine.
-    - limits number of candidate sentences encoded to max_sentences (speed)
-    - returns list of canonical skills sorted by score (descending)
+    Batched embedding_match: the candidate lines of all texts go through one encode and
+    one index search (one large matmul without faiss), then are split back per text.
+    exclude_skills: canonical skills already found (e.g. by keyword_match); they are never
+    returned, and lines consisting of just one of them are not encoded.
+    Both backends return every skill whose best exact (float32) score over a text's candidates
+    is >= threshold (FAISS: HNSW range search, re-scored exactly; numpy: column max). top_k is no longer
+    applied and only kept for existing callers.
+    Returns one list of canonical skills per text, each sorted by score (descending).
     """
-    # load canonical
-    canonical_skills, canonical_embs = load_canonical_skills_and_embeddings(precomputed_emb_path, model_name)
-
-    # split into candidate sentences/lines
-    # give priority to lines with colons, dashes, bullets, parentheses, or that contain digits (years)
-    lines = [l.strip() for l in re.split(r'[\n\r]', text) if l.strip()]
-    # heuristics: keep lines that are likely to be useful
-    scored_lines = []
-    for ln in lines:
-        score = 0
-        if re.search(r'[-••–—:;]', ln):
-            score += 1
-        if re.search(r'\d{4}', ln):  # contains a year
-            score += 1
-        if len(ln.split()) <= 5:
-            score += 1
-        if re.search(r'(experience|developed|built|worked|managed|implemented|designed|deployed|using|utiliz)', ln.lower()):
-            score += 2
-        scored_lines.append((score, ln))
-    # sort by heuristics descending and take top max_sentences
-    scored_lines.sort(key=lambda x: -x[0])
-    candidates = [ln for _, ln in scored_lines][:max_sentences]
+    if fingerprint is None:
+        fingerprint = ontology_fingerprint()
+    exclude_skills = frozenset(exclude_skills or ())
+    skip = frozenset(s.lower() for s in exclude_skills)
+    per_doc = [_candidate_lines(text, max_sentences, skip) for text in texts]
+    candidates = [c for cands in per_doc for c in cands]
     if not candidates:
-        # fallback: split full text into sentences
-        candidates = [s.strip() for s in re.split(r'[.\n]', text) if s.strip()][:max_sentences]
+        return [[] for _ in per_doc]
+    # row -> index of the text it came from
+    doc_ids = np.repeat(np.arange(len(per_doc)), [len(cands) for cands in per_doc])
+    canonical_skills, canonical_embs = load_canonical_skills_and_embeddings(precomputed_emb_path, model_name, fingerprint)
+
     # encode candidates (in batch)
-    model = get_sentence_transformer(model_name)
-    cand_embs = model.encode(candidates, convert_to_numpy=True, show_progress_bar=False)
-    # compute cosine with canonical embs (numpy)
-    sim = cosine_sim_numpy(cand_embs, canonical_embs)  # shape (len(candidates), len(skills))
-    # for each canonical skill collect max similarity across candidates
-    max_scores = np.max(sim, axis=0)  # shape (len(skills),)
-    hits = {}
-    for idx, score in enumerate(max_scores):
-        if float(score) >= threshold:
-            hits[canonical_skills[idx]] = float(score)
-    # sort hits by score desc
-    sorted_hits = sorted(hits.items(), key=lambda x: -x[1])
-    return [s for s, sc in sorted_hits]
-
-def extract_skills_from_text(text: str, use_embeddings: bool = True, threshold: float = 0.56, max_sentences: int = 40, precomputed_emb_path: str = None):
+    if model is None:
+        model = get_sentence_transformer(model_name)
+    # float32 + C-contiguous so both the FAISS search and the numpy matmul take their fast path
+    cand_embs = _encode(model, candidates)
+    excluded = np.fromiter((s in exclude_skills for s in canonical_skills), dtype=bool, count=len(canonical_skills))
+    n_excluded = int(excluded.sum())
+    best = np.full((len(per_doc), len(canonical_skills)), -np.inf, dtype=np.float32)
+    index = get_canonical_index(precomputed_emb_path, model_name, fingerprint)
+    if index is not None:
+        # the index scores 8-bit codes, so search slightly below threshold and re-score the
+        # returned (candidate, skill) pairs exactly against the float32 embeddings; the threshold
+        # is then applied to the same scores as on the numpy path
+        lims, _, I = index.range_search(cand_embs, threshold - SQ_SCORE_MARGIN)
+        cand_rows = np.repeat(np.arange(len(candidates)), np.diff(lims).astype(np.int64))
+        D = np.einsum("ij,ij->i", cand_embs[cand_rows], np.asarray(canonical_embs)[I])
+        # best score per (text, skill) across candidates
+        rows = doc_ids[cand_rows]
+        keep = D >= threshold
+        if n_excluded:
+            keep &= ~excluded[I]
+        np.maximum.at(best, (rows[keep], I[keep]), D[keep])
+    else:
+        # cosine with the unit-norm canonical embs (numpy), shape (len(candidates), len(skills))
+        sim = cand_embs @ get_canonical_matrix_t(precomputed_emb_path, model_name, fingerprint)
+        if n_excluded:
+            sim[:, excluded] = -np.inf
+        # the full matrix is already here, so no top_k cut: best score per skill is the
+        # column max over each text's (contiguous) rows
+        counts = np.bincount(doc_ids, minlength=len(per_doc))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        has_rows = counts > 0
+        best[has_rows] = np.maximum.reduceat(sim, starts[has_rows], axis=0)
+    results = []
+    for doc_best in best:
+        hit_idx = np.flatnonzero(doc_best >= threshold)
+        # sort hits by score desc
+        hit_idx = hit_idx[np.argsort(-doc_best[hit_idx], kind="stable")]
+        results.append([canonical_skills[idx] for idx in hit_idx.tolist()])
+    return results
+
+def embedding_match(text: str, top_k: int = 6, threshold: float = 0.56, max_sentences: int = 40, model_name: str = "all-MiniLM-L6-v2", precomputed_emb_path: str = None, model=None, fingerprint: str = None, exclude_skills=None):
+    """
+    Semantic fuzzy match using sentence-transformers embeddings.
+    - limits number of candidate sentences encoded to max_sentences (speed)
+    - model: already-loaded sentence transformer (loaded from model_name if None)
+    - fingerprint: ontology_fingerprint() if the caller already has it
+    - best score per skill over all candidates, via a FAISS range search at threshold
+      (numpy cosine if faiss is missing); top_k is unused, see embedding_match_many
+    - exclude_skills: canonical skills to leave out (see embedding_match_many)
+    - returns list of canonical skills sorted by score (descending)
+    Use embedding_match_many to match several texts in one batch.
+    """
+    return embedding_match_many([text], top_k=top_k, threshold=threshold, max_sentences=max_sentences, model_name=model_name, precomputed_emb_path=precomputed_emb_path, model=model, fingerprint=fingerprint, exclude_skills=exclude_skills)[0]
+
+def _model_threshold(model_name: str, threshold: float, use_embeddings: bool):
+    # explicit threshold, else the model's calibrated one (irrelevant without embeddings)
+    if threshold is not None or not use_embeddings:
+        return threshold
+    if model_name not in MODEL_THRESHOLDS:
+        raise ValueError(f"No calibrated threshold for {model_name}; pass threshold explicitly.")
+    return MODEL_THRESHOLDS[model_name]
+
+def extract_skills_from_text(text: str, use_embeddings: bool = True, threshold: float = None, max_sentences: int = 40, precomputed_emb_path: str = None, model_name: str = "all-MiniLM-L6-v2"):
     """
     Combined exact keyword + embedding fuzzy matching.
     use_embeddings: toggle to speed up (fast mode: False)
+    threshold: embedding similarity cutoff, MODEL_THRESHOLDS[model_name] if None
+    model_name: sentence-transformers model, e.g. STATIC_MODEL_NAME for the lookup-only encoder
+    Fast mode only reads the ontology; the embeddings and the model are loaded on first
+    use inside embedding_match (and the model only if there is something to encode).
+    Falls back to the exact matches alone if embedding matching fails.
     """
-    text_clean = simple_text_cleanup(text)
-    canonical_skills, _ = load_canonical_skills_and_embeddings(precomputed_emb_path)
-    exact = set(keyword_match(text_clean, canonical_skills))
+    threshold = _model_threshold(model_name, threshold, use_embeddings)
+    return _extract_skills(text, use_embeddings, threshold, max_sentences, precomputed_emb_path, model_name, fallback_to_exact=True)
+
+def _extract_skills(text: str, use_embeddings: bool, threshold: float, max_sentences: int, precomputed_emb_path: str, model_name: str, fallback_to_exact: bool):
+    # extract_skills_from_text; with fallback_to_exact=False an embedding failure is raised instead
+    text_lines = _cleanup_lines(text)
+    text_clean = text_lines.replace("\n", " ")
+    fingerprint = ontology_fingerprint()
+    exact = set(keyword_match(text_clean, load_skills_ontology(fingerprint), already_lower=True))
     embed = set()
     if use_embeddings:
         try:
-            embed = set(embedding_match(text_clean, threshold=threshold, max_sentences=max_sentences, precomputed_emb_path=precomputed_emb_path))
-        except Exception as e:
+            embed = set(embedding_match(text_lines, threshold=threshold, max_sentences=max_sentences, model_name=model_name, precomputed_emb_path=precomputed_emb_path, fingerprint=fingerprint, exclude_skills=exact))
+        except Exception:
+            if not fallback_to_exact:
+                raise
             # fallback to exact only
             embed = set()
-    combined = sorted(list(exact.union(embed)))
+    combined = sorted({_canon(s) for s in exact.union(embed)})
     return combined
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_extract(text_hash: str, _text: str, use_embeddings: bool, threshold: float, max_sentences: int, precomputed_emb_path: str, model_name: str, fingerprint: str):
+    # _text is excluded from Streamlit's cache key; text_hash stands in for it.
+    # Embedding failures raise (and st.cache_data does not store exceptions), so a degraded
+    # exact-only result is never memoized for the embedding call.
+    return _extract_skills(_text, use_embeddings, threshold, max_sentences, precomputed_emb_path, model_name, fallback_to_exact=False)
+
+def extract_skills_cached(text: str, use_embeddings: bool = True, threshold: float = None, max_sentences: int = 40, precomputed_emb_path: str = None, model_name: str = "all-MiniLM-L6-v2"):
+    """
+    extract_skills_from_text memoized by a content hash of the text (and the ontology),
+    so re-running Analyze on the same input skips cleanup, matching and encoding.
+    If embedding matching fails, returns the exact matches alone without caching that
+    result under the embedding call, so it is retried next time.
+    threshold: as in extract_skills_from_text (the model's calibrated threshold if None).
+    """
+    threshold = _model_threshold(model_name, threshold, use_embeddings)
+    text_hash = hashlib.blake2b(text.encode("utf8"), digest_size=16).hexdigest()
+    fingerprint = ontology_fingerprint()
+    try:
+        return _cached_extract(text_hash, text, use_embeddings, threshold, max_sentences, precomputed_emb_path, model_name, fingerprint)
+    except Exception:
+        if not use_embeddings:
+            raise
+        # fallback to exact only
+        return _cached_extract(text_hash, text, False, threshold, max_sentences, precomputed_emb_path, model_name, fingerprint)
+
 # -------------------------
 # Compare helper
 # -------------------------
+@st.cache_resource(show_spinner=False)
+def load_roles():
+    """
+    Returns the grouped roles dict (profile -> role -> skills) from roles.json.
+    Parsed once per process and shared read-only across reruns (cache_data would
+    unpickle a fresh copy on every rerun).
+    """
+    with open(BASE_DIR / "roles.json", "r", encoding="utf8") as f:
+        return json.load(f)
+
+def _canon(skill: str):
+    return skill.strip().lower()
+
 def compare_user_with_role_skills(user_skills, role_skills):
-    missing = list(set(role_skills) - set(user_skills))
-    extra = list(set(user_skills) - set(role_skills))
-    matching = list(set(user_skills).intersection(role_skills))
-    score = len(matching) / len(role_skills) if role_skills else 0
+    # canonicalize once so "Python" and "python " count as the same skill
+    user_set = frozenset(_canon(s) for s in user_skills if s)
+    role_set = frozenset(_canon(s) for s in role_skills if s)
+    missing = sorted(role_set - user_set)
+    extra = sorted(user_set - role_set)
+    matching = sorted(user_set & role_set)
+    score = len(matching) / len(role_set) if role_set else 0
 
     return {
         "missing": missing,
@@ -216,67 +845,210 @@ def compare_user_with_role_skills(user_skills, role_skills):
 # -------------------------
 # GitHub & LinkedIn helpers
 # -------------------------
+GITHUB_MAX_WORKERS = 8
+HTTP_CACHE_PATH = BASE_DIR / ".http_cache"
+SKILL_README_MAX_BYTES = 5000
+README_TTL = 3600
+LINKEDIN_TTL = 86400
+
+def _http_session(cached: bool = True):
+    """
+    requests-cache CachedSession backed by SQLite (plain requests.Session if requests-cache is
+    missing, or for cached=False).
+    Responses are kept for an hour; stale entries carrying an
+    ETag / Last-Modified are revalidated, so unchanged pages come back as 304 with no body.
+    Capped (streamed) downloads must use cached=False: CachedSession reads the whole body
+    to store it, before iter_content ever runs. Their capped text is memoized with
+    st.cache_data instead (_cached_readme, _fetch_linkedin_text).
+    """
+    if not cached:
+        import requests
+        return requests.Session()
+    try:
+        import requests_cache
+    except ImportError:
+        import requests
+        return requests.Session()
+    return requests_cache.CachedSession(
+        str(HTTP_CACHE_PATH),
+        backend="sqlite",
+        expire_after=3600,
+        cache_control=True,
+    )
+
+def _read_capped(response, max_bytes: int):
+    # stream the body and stop once max_bytes have been read
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=8192):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            break
+    response.close()
+    return b"".join(chunks)[:max_bytes].decode(response.encoding or "utf-8", errors="ignore")
+
+def _gh_session(token: str = None, cached: bool = True):
+    """
+    Session (see _http_session) with a connection pool sized for the parallel per-repo fetches,
+    so README / languages requests reuse TCP+TLS connections.
+    """
+    from requests.adapters import HTTPAdapter
+    session = _http_session(cached)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("https://", adapter)
+    if token:
+        session.headers["Authorization"] = f"token {token}"
+    return session
+
+def _get_capped(session, url: str, max_bytes: int, **kwargs):
+    # first max_bytes of a 200 response (None on 404); other statuses raise, so callers memoizing
+    # the result with st.cache_data never store a transient failure
+    import requests
+    r = session.get(url, stream=True, **kwargs)
+    if r.status_code != 200:
+        r.close()
+        if r.status_code == 404:
+            return None
+        raise requests.HTTPError(f"{r.status_code} for {url}", response=r)
+    return _read_capped(r, max_bytes)
+
+@st.cache_data(show_spinner=False, ttl=README_TTL, max_entries=256)
+def _cached_readme(raw_url: str, _session):
+    """
+    First SKILL_README_MAX_BYTES of a raw README (None on 404), memoized per URL for README_TTL,
+    so Streamlit reruns don't download it again (_session, uncached and pooled, is not part of the key).
+    """
+    return _get_capped(_session, raw_url, SKILL_README_MAX_BYTES, timeout=6)
+
+def _fetch_repo_readme(session, repo):
+    owner = repo.get("owner", {}).get("login")
+    repo_name = repo.get("name")
+    # the repo listing carries the default branch; otherwise try main first (modern repos), then master
+    branches = [repo["default_branch"]] if repo.get("default_branch") else ["main", "master"]
+    for branch in branches:
+        raw_url = f"https://raw.githubusercontent.com/{owner}/{repo_name}/{branch}/README.md"
+        try:
+            readme = _cached_readme(raw_url, session)
+        except Exception:
+            return ""
+        if readme is not None:
+            return readme
+    return ""
+
+def _fetch_repo_languages(session, repo):
+    langs_url = repo.get("languages_url")
+    try:
+        rr = session.get(langs_url, timeout=6)
+        if rr.status_code == 200:
+            return rr.json()
+    except Exception:
+        pass
+    return {}
+
 def fetch_github_profile_readme(username: str, token: str = None, max_repos: int = 10):
     """
     Fetch the README or repo descriptions for a public GitHub username via GitHub API.
     Returns combined text of README and repo descriptions.
     token: optional personal access token to increase rate limit.
+    READMEs are fetched in parallel over one pooled session, outside the HTTP cache so that only
+    their first SKILL_README_MAX_BYTES are downloaded; that capped text is memoized per URL
+    (_cached_readme). The repo listing goes through the HTTP cache.
     """
-    import requests
-    headers = {}
-    if token:
-        headers["Authorization"] = f"token {token}"
+    from concurrent.futures import ThreadPoolExecutor
     base = "https://api.github.com"
-    # fetch user repos
-    repos_url = f"{base}/users/{username}/repos?per_page={max_repos}&sort=updated"
-    r = requests.get(repos_url, headers=headers, timeout=10)
-    if r.status_code != 200:
-        return ""
-    items = r.json()
+    with _gh_session(token) as session, _gh_session(cached=False) as raw_session:
+        # fetch user repos
+        repos_url = f"{base}/users/{username}/repos?per_page={max_repos}&sort=updated"
+        r = session.get(repos_url, timeout=10)
+        if r.status_code != 200:
+            return ""
+        items = r.json()
+        with ThreadPoolExecutor(max_workers=GITHUB_MAX_WORKERS) as pool:
+            readmes = list(pool.map(lambda repo: _fetch_repo_readme(raw_session, repo), items))
     pieces = []
-    for repo in items:
+    for repo, readme in zip(items, readmes):
         # repo description
         if repo.get("description"):
             pieces.append(repo.get("description"))
-        # try README raw
-        owner = repo.get("owner", {}).get("login")
-        repo_name = repo.get("name")
-        raw_url = f"https://raw.githubusercontent.com/{owner}/{repo_name}/master/README.md"
-        try:
-            rr = requests.get(raw_url, headers=headers, timeout=6)
-            if rr.status_code == 200 and rr.text:
-                pieces.append(rr.text[:5000])
-        except Exception:
-            pass
+        if readme:
+            pieces.append(readme)
     return "\n\n".join(pieces)
 
 def fetch_github_languages(username: str, token: str = None, max_repos: int = 20):
     """
     Returns aggregated language usage from user's public repos (dict language -> bytes)
     """
-    import requests
-    headers = {}
-    if token:
-        headers["Authorization"] = f"token {token}"
+    from concurrent.futures import ThreadPoolExecutor
     base = "https://api.github.com"
-    repos_url = f"{base}/users/{username}/repos?per_page={max_repos}&sort=updated"
-    r = requests.get(repos_url, headers=headers, timeout=10)
-    if r.status_code != 200:
-        return {}
-    repos = r.json()
+    with _gh_session(token) as session:
+        repos_url = f"{base}/users/{username}/repos?per_page={max_repos}&sort=updated"
+        r = session.get(repos_url, timeout=10)
+        if r.status_code != 200:
+            return {}
+        repos = r.json()
+        with ThreadPoolExecutor(max_workers=GITHUB_MAX_WORKERS) as pool:
+            per_repo = list(pool.map(lambda repo: _fetch_repo_languages(session, repo), repos))
     lang_agg = {}
-    for repo in repos:
-        langs_url = repo.get("languages_url")
-        try:
-            rr = requests.get(langs_url, headers=headers, timeout=6)
-            if rr.status_code == 200:
-                data = rr.json()
-                for k, v in data.items():
-                    lang_agg[k] = lang_agg.get(k, 0) + v
-        except Exception:
-            pass
+    for data in per_repo:
+        for k, v in data.items():
+            lang_agg[k] = lang_agg.get(k, 0) + v
     return lang_agg
 
+LINKEDIN_MAX_BYTES = 512 * 1024
+LINKEDIN_MAX_LINES = 500
+
+def _html_visible_text(html_text: str):
+    """
+    Visible text of an HTML page (scripts/styles removed), one text node per line.
+    Uses the selectolax C parser when installed, else BeautifulSoup (lxml, then html.parser).
+    """
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+    if HTMLParser is not None:
+        tree = HTMLParser(html_text)
+        for node in tree.css("script, style, noscript"):
+            node.decompose()
+        root = tree.body or tree.root
+        return root.text(separator="\n") if root is not None else ""
+
+    from bs4 import BeautifulSoup
+    try:
+        soup = BeautifulSoup(html_text, "lxml")
+    except Exception:
+        # bs4.FeatureNotFound when lxml is not installed
+        soup = BeautifulSoup(html_text, "html.parser")
+    # remove scripts/styles
+    for script in soup(["script", "style", "noscript"]):
+        script.extract()
+    return soup.get_text(separator="\n")
+
+@st.cache_data(show_spinner=False, ttl=LINKEDIN_TTL, max_entries=32)
+def _fetch_linkedin_text(profile_url: str, user_agent: str):
+    """
+    Visible text of a public LinkedIn page, memoized per URL for LINKEDIN_TTL. The download
+    bypasses the HTTP cache (a CachedSession would fetch and store the whole page before the
+    cap applies); failures raise, so they are not memoized.
+    """
+    headers = {"User-Agent": user_agent}
+    with _http_session(cached=False) as session:
+        # meaningful profile content sits well inside the first LINKEDIN_MAX_BYTES
+        html_text = _get_capped(session, profile_url, LINKEDIN_MAX_BYTES, headers=headers, timeout=10)
+    if html_text is None:
+        return ""
+    text = _html_visible_text(html_text)
+    # do some cleanup, stopping at the first LINKEDIN_MAX_LINES non-empty lines
+    lines = []
+    for ln in text.splitlines():
+        ln = ln.strip()
+        if ln:
+            lines.append(ln)
+            if len(lines) >= LINKEDIN_MAX_LINES:
+                break
+    return "\n".join(lines)
+
 def fetch_linkedin_public_text(profile_url: str, user_agent: str = None):
     """
     Best-effort public LinkedIn HTML fetch and visible text extraction.
@@ -284,22 +1056,7 @@ def fetch_linkedin_public_text(profile_url: str, user_agent: str = None):
     This function attempts to fetch and parse the public HTML. It may return empty or partial content.
     Prefer asking the user to paste their LinkedIn profile text or export as PDF.
     """
-    import requests
-    from bs4 import BeautifulSoup
-
-    headers = {"User-Agent": user_agent or "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
     try:
-        r = requests.get(profile_url, headers=headers, timeout=10)
-        if r.status_code != 200:
-            return ""
-        soup = BeautifulSoup(r.text, "html.parser")
-        # remove scripts/styles
-        for script in soup(["script", "style", "noscript"]):
-            script.extract()
-        # join visible text
-        text = soup.get_text(separator="\n")
-        # do some cleanup
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        return "\n".join(lines[:500])  # limit to first 500 lines
+        return _fetch_linkedin_text(profile_url, user_agent or "Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
     except Exception:
         return ""